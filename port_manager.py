@@ -6,6 +6,7 @@ Handles port allocation and conflict resolution for the Name Generation System.
 
 import socket
 import logging
+import time
 from typing import Optional, Tuple
 
 logger = logging.getLogger(__name__)
@@ -20,6 +21,19 @@ def is_port_available(port: int, host: str = "localhost") -> bool:
     except Exception:
         return False
 
+def wait_for_port(port: int, host: str = "localhost", timeout: float = 30.0, interval: float = 0.2) -> bool:
+    """Wait until a service accepts connections on a port, up to timeout seconds."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with socket.create_connection((host, port), timeout=1):
+                return True
+        except OSError:
+            if time.monotonic() >= deadline:
+                logger.warning(f"Timed out waiting for {host}:{port}")
+                return False
+            time.sleep(interval)
+
 def find_available_port(start_port: int, max_attempts: int = 10, host: str = "localhost") -> Optional[int]:
     """Find an available port starting from start_port."""
     for i in range(max_attempts):
@@ -71,18 +85,22 @@ def print_port_status():
     try:
         status = check_ports_status()
         
-        print("Port Status:")
-        print("=" * 40)
-        print(f"MCP Server:")
-        print(f"  Port: {status['mcp']['port']}")
-        print(f"  Available: {'✅' if status['mcp']['available'] else '❌'}")
-        print(f"  URL: {status['mcp']['url']}")
-        print()
-        print(f"API Server:")
-        print(f"  Port: {status['api']['port']}")
-        print(f"  Available: {'✅' if status['api']['available'] else '❌'}")
-        print(f"  URL: {status['api']['url']}")
-        print("=" * 40)
+        # Build the report first and write it with a single print call
+        lines = [
+            "Port Status:",
+            "=" * 40,
+            "MCP Server:",
+            f"  Port: {status['mcp']['port']}",
+            f"  Available: {'✅' if status['mcp']['available'] else '❌'}",
+            f"  URL: {status['mcp']['url']}",
+            "",
+            "API Server:",
+            f"  Port: {status['api']['port']}",
+            f"  Available: {'✅' if status['api']['available'] else '❌'}",
+            f"  URL: {status['api']['url']}",
+            "=" * 40
+        ]
+        print("\n".join(lines))
         
         return status
         
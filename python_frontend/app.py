@@ -8,7 +8,12 @@ import logging
 import sys
 import os
 import requests
+from requests.adapters import HTTPAdapter
 import json
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 
 # Add src to path for imports
@@ -35,8 +40,158 @@ except Exception as e:
     logger.error(f"Failed to initialize Ollama service: {e}")
     ollama_service = None
 
-# MCP Server URL
-MCP_SERVER_URL = "http://localhost:8500"
+# MCP Server URL (loopback IP avoids a name lookup on every new connection);
+# override with MCP_SERVER_URL to point the frontend at a remote server
+MCP_SERVER_URL = os.environ.get("MCP_SERVER_URL", "http://127.0.0.1:8500")
+
+# Maximum number of tool calls in flight to the MCP server at once; extra
+# requests wait for a slot instead of piling onto the server
+MCP_MAX_CONCURRENCY = int(os.environ.get("MCP_MAX_CONCURRENCY", "8"))
+_mcp_call_slots = threading.BoundedSemaphore(MCP_MAX_CONCURRENCY)
+
+# Shared HTTP session so MCP calls reuse pooled keep-alive connections (and,
+# for https servers, one TLS context and resumed handshakes per host)
+mcp_session = requests.Session()
+_mcp_adapter = HTTPAdapter(pool_maxsize=MCP_MAX_CONCURRENCY)
+mcp_session.mount("http://", _mcp_adapter)
+mcp_session.mount("https://", _mcp_adapter)
+
+# (connect, read) timeouts: fail fast when the MCP server is down while
+# leaving tool execution its full read budget
+MCP_CONNECT_TIMEOUT = 2.0
+MCP_LIST_TIMEOUT = (MCP_CONNECT_TIMEOUT, 10.0)
+MCP_CALL_TIMEOUT = (MCP_CONNECT_TIMEOUT, 30.0)
+
+# Cache lifetimes (seconds) for deterministic MCP tools; generation is never cached
+MCP_CACHE_TTLS = {
+    "get_cultural_context": 3600
+}
+MCP_CACHE_ENABLED = os.environ.get("MCP_NO_CACHE") != "1"
+
+# Bounds on the tool result cache: entry count (least recently used entries are
+# evicted first) and how long past its TTL an entry may still be served while a
+# background refresh is failing
+MCP_CACHE_MAX_ENTRIES = 256
+MCP_CACHE_MAX_STALE = 300
+
+# Last tool catalog fetched from the MCP server and its ETag
+_mcp_tools_cache = {"etag": None, "tools": None}
+
+# Stale-while-revalidate LRU cache: key -> (stored_at, response)
+_mcp_cache = OrderedDict()
+_mcp_refreshing = set()
+_mcp_cache_lock = threading.Lock()
+
+
+def _read_mcp_response(response):
+    """Decode an MCP server response body in a single pass, raising on HTTP errors."""
+    if response.status_code >= 400:
+        raise RuntimeError(f"MCP server returned {response.status_code}: {response.text[:200]}")
+    return json.loads(response.content)
+
+
+def _tool_call_request(request_id, tool_name, arguments):
+    """Build a JSON-RPC tools/call request object."""
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "method": "tools/call",
+        "params": {
+            "name": tool_name,
+            "arguments": arguments
+        }
+    }
+
+
+def _post_mcp(payload):
+    """POST a JSON-RPC request to the MCP server."""
+    with _mcp_call_slots:
+        response = mcp_session.post(f"{MCP_SERVER_URL}/mcp", json=payload, timeout=MCP_CALL_TIMEOUT)
+    return _read_mcp_response(response)
+
+
+def _post_mcp_tool_call(tool_name, arguments):
+    """Send a JSON-RPC tools/call request to the MCP server."""
+    return _post_mcp(_tool_call_request(1, tool_name, arguments))
+
+
+def _mcp_cache_key(tool_name, arguments):
+    """Build a cache key from the tool name and canonicalized arguments."""
+    canonical = json.dumps(arguments, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(f"{tool_name}:{canonical}".encode()).hexdigest()
+
+
+def _is_cacheable_result(result):
+    """Return True only for successful tool call replies."""
+    payload = result.get("result")
+    if "error" in result or not isinstance(payload, dict) or payload.get("isError"):
+        return False
+    
+    # Tool failures come back as result text: "Error: ..." or an {"error": ...} payload
+    for item in payload.get("content", []):
+        text = item.get("text", "") if isinstance(item, dict) else ""
+        if text.startswith("Error:"):
+            return False
+        try:
+            decoded = json.loads(text)
+        except ValueError:
+            continue
+        if isinstance(decoded, dict) and "error" in decoded:
+            return False
+    return True
+
+
+def _store_mcp_result(key, result):
+    """Cache a successful tool call result, evicting the least recently used entry."""
+    if not _is_cacheable_result(result):
+        return
+    with _mcp_cache_lock:
+        _mcp_cache[key] = (time.monotonic(), result)
+        _mcp_cache.move_to_end(key)
+        while len(_mcp_cache) > MCP_CACHE_MAX_ENTRIES:
+            _mcp_cache.popitem(last=False)
+
+
+def _refresh_mcp_cache(key, tool_name, arguments):
+    """Re-fetch a stale cache entry in the background."""
+    try:
+        _store_mcp_result(key, _post_mcp_tool_call(tool_name, arguments))
+    except Exception as e:
+        logger.warning(f"Background refresh of {tool_name} failed: {e}")
+    finally:
+        with _mcp_cache_lock:
+            _mcp_refreshing.discard(key)
+
+
+def _call_mcp_tool(tool_name, arguments):
+    """Call an MCP tool, serving cacheable tools stale-while-revalidate."""
+    ttl = MCP_CACHE_TTLS.get(tool_name)
+    if not MCP_CACHE_ENABLED or ttl is None:
+        return _post_mcp_tool_call(tool_name, arguments)
+    
+    key = _mcp_cache_key(tool_name, arguments)
+    with _mcp_cache_lock:
+        entry = _mcp_cache.get(key)
+        if entry is not None:
+            stored_at, result = entry
+            age = time.monotonic() - stored_at
+            if age < ttl + MCP_CACHE_MAX_STALE:
+                _mcp_cache.move_to_end(key)
+                if age >= ttl and key not in _mcp_refreshing:
+                    # Serve the stale result now and refresh it in the background
+                    _mcp_refreshing.add(key)
+                    threading.Thread(
+                        target=_refresh_mcp_cache,
+                        args=(key, tool_name, arguments),
+                        daemon=True
+                    ).start()
+                return result
+            # Too stale to serve (refreshes keep failing); fetch synchronously
+            del _mcp_cache[key]
+    
+    result = _post_mcp_tool_call(tool_name, arguments)
+    _store_mcp_result(key, result)
+    return result
 
 @app.route('/')
 def index():
@@ -51,9 +206,21 @@ def health():
 def list_mcp_tools():
     """List available MCP tools."""
     try:
-        response = requests.get(f"{MCP_SERVER_URL}/mcp", timeout=10)
-        response.raise_for_status()
-        return jsonify(response.json())
+        headers = {}
+        if _mcp_tools_cache["etag"]:
+            headers["If-None-Match"] = _mcp_tools_cache["etag"]
+        
+        response = mcp_session.get(f"{MCP_SERVER_URL}/mcp", headers=headers,
+                                   timeout=MCP_LIST_TIMEOUT)
+        if response.status_code == 304 and _mcp_tools_cache["tools"] is not None:
+            # Catalog unchanged since the last fetch
+            return jsonify(_mcp_tools_cache["tools"])
+        
+        tools = _read_mcp_response(response)
+        etag = response.headers.get("ETag")
+        if etag:
+            _mcp_tools_cache.update(etag=etag, tools=tools)
+        return jsonify(tools)
     except Exception as e:
         logger.error(f"Error listing MCP tools: {e}")
         return jsonify({"error": f"Failed to list MCP tools: {str(e)}"}), 500
@@ -63,6 +230,7 @@ def call_mcp_tool():
     """Call an MCP tool."""
     try:
         data = request.get_json()
+        
         tool_name = data.get('tool_name')
         arguments = data.get('arguments', {})
         
@@ -70,20 +238,7 @@ def call_mcp_tool():
             return jsonify({"error": "tool_name is required"}), 400
         
         # Call the MCP server
-        payload = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "tools/call",
-            "params": {
-                "name": tool_name,
-                "arguments": arguments
-            }
-        }
-        
-        response = requests.post(f"{MCP_SERVER_URL}/mcp", json=payload, timeout=30)
-        response.raise_for_status()
-        
-        return jsonify(response.json())
+        return jsonify(_call_mcp_tool(tool_name, arguments))
         
     except Exception as e:
         logger.error(f"Error calling MCP tool: {e}")
@@ -96,28 +251,17 @@ def generate_cultural_names_mcp():
         data = request.get_json()
         
         # Call the MCP generate_cultural_names tool
-        payload = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "tools/call",
-            "params": {
-                "name": "generate_cultural_names",
-                "arguments": {
-                    "sex": data.get("sex"),
-                    "age": int(data.get("age", 25)),
-                    "location": data.get("location"),
-                    "occupation": data.get("occupation"),
-                    "race": data.get("race"),
-                    "religion": data.get("religion"),
-                    "birth_year": int(data.get("birth_year", 1999))
-                }
-            }
+        arguments = {
+            "sex": data.get("sex"),
+            "age": int(data.get("age", 25)),
+            "location": data.get("location"),
+            "occupation": data.get("occupation"),
+            "race": data.get("race"),
+            "religion": data.get("religion"),
+            "birth_year": int(data.get("birth_year", 1999))
         }
         
-        response = requests.post(f"{MCP_SERVER_URL}/mcp", json=payload, timeout=30)
-        response.raise_for_status()
-        
-        return jsonify(response.json())
+        return jsonify(_call_mcp_tool("generate_cultural_names", arguments))
         
     except Exception as e:
         logger.error(f"Error generating cultural names via MCP: {e}")
@@ -134,22 +278,7 @@ def validate_names_mcp():
             return jsonify({"error": "names array is required"}), 400
         
         # Call the MCP validate_names_watchlist tool
-        payload = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "tools/call",
-            "params": {
-                "name": "validate_names_watchlist",
-                "arguments": {
-                    "names": names
-                }
-            }
-        }
-        
-        response = requests.post(f"{MCP_SERVER_URL}/mcp", json=payload, timeout=30)
-        response.raise_for_status()
-        
-        return jsonify(response.json())
+        return jsonify(_call_mcp_tool("validate_names_watchlist", {"names": names}))
         
     except Exception as e:
         logger.error(f"Error validating names via MCP: {e}")
@@ -166,31 +295,21 @@ def get_cultural_context_mcp():
         if not region or not religion:
             return jsonify({"error": "region and religion are required"}), 400
         
-        # Call the MCP get_cultural_context tool
-        payload = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "tools/call",
-            "params": {
-                "name": "get_cultural_context",
-                "arguments": {
-                    "region": region,
-                    "religion": religion
-                }
-            }
+        # Call the MCP get_cultural_context tool, which takes (race, religion, location)
+        arguments = {
+            "race": data.get("race") or "Unknown",
+            "religion": religion,
+            "location": region
         }
         
-        response = requests.post(f"{MCP_SERVER_URL}/mcp", json=payload, timeout=30)
-        response.raise_for_status()
-        
-        return jsonify(response.json())
+        return jsonify(_call_mcp_tool("get_cultural_context", arguments))
         
     except Exception as e:
         logger.error(f"Error getting cultural context via MCP: {e}")
         return jsonify({"error": f"Failed to get cultural context: {str(e)}"}), 500
 
-@app.route('/api/generate-identity', methods=['POST'])
-def generate_identity():
+def _generate_identity_response(action, endpoint_name):
+    """Generate identities for the posted form; shared by generate and regenerate."""
     try:
         data = request.get_json()
         
@@ -225,60 +344,22 @@ def generate_identity():
             logger.error("Ollama service not available, using fallback")
             return jsonify({"error": "Ollama service not available"}), 500
             
-        # Generate names using Ollama service
-        logger.info(f"Generating names using Ollama for: {request_data}")
+        logger.info(f"{action} names using Ollama for: {request_data}")
         identities = ollama_service.generate_cultural_names(request_data)
         
         return jsonify(identities)
             
     except Exception as e:
-        logger.error(f"Error in generate_identity: {e}")
+        logger.error(f"Error in {endpoint_name}: {e}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/generate-identity', methods=['POST'])
+def generate_identity():
+    return _generate_identity_response("Generating", "generate_identity")
+
 @app.route('/api/regenerate-identity', methods=['POST'])
 def regenerate_identity():
-    try:
-        data = request.get_json()
-        
-        # Prepare request data for Ollama service
-        request_data = {
-            "sex": data.get("sex"),
-            "location": data.get("location"),
-            "age": int(data.get("age", 0)),
-            "occupation": data.get("occupation"),
-            "race": data.get("race"),
-            "religion": data.get("religion"),
-            "birth_year": int(data.get("birth_year", 0)),
-            "birth_country": data.get("birth_country"),
-            "citizenship_country": data.get("citizenship_country"),
-            "diaspora_generation": data.get("diaspora_generation")
-        }
-        
-        # Handle "Other" options
-        if data.get("race") == "Other" and data.get("race_other"):
-            request_data["race"] = data.get("race_other")
-        if data.get("religion") == "Other" and data.get("religion_other"):
-            request_data["religion"] = data.get("religion_other")
-        
-        # Process feedback context if provided
-        feedback_context = data.get("feedback_context")
-        if feedback_context:
-            logger.info(f"Using feedback context: {feedback_context}")
-            request_data["feedback_context"] = feedback_context
-        
-        # Use Ollama service to regenerate culturally appropriate names
-        if ollama_service is None:
-            logger.error("Ollama service not available, using fallback")
-            return jsonify({"error": "Ollama service not available"}), 500
-            
-        logger.info(f"Regenerating names using Ollama for: {request_data}")
-        identities = ollama_service.generate_cultural_names(request_data)
-        
-        return jsonify(identities)
-            
-    except Exception as e:
-        logger.error(f"Error in regenerate_identity: {e}")
-        return jsonify({"error": str(e)}), 500
+    return _generate_identity_response("Regenerating", "regenerate_identity")
 
 @app.route('/api/traceability/<request_id>')
 def get_traceability(request_id):
@@ -298,39 +379,40 @@ def get_traceability(request_id):
         return jsonify({"error": str(e)}), 500
 
 
+# Supported cultures, built once at import time and served by /api/cultures
+SUPPORTED_CULTURES = (
+    {"code": "sudanese", "name": "Sudanese", "description": "Arabic/Islamic naming traditions"},
+    {"code": "spanish", "name": "Spanish", "description": "Traditional Spanish naming conventions"},
+    {"code": "chinese", "name": "Chinese", "description": "Chinese naming patterns"},
+    {"code": "indian", "name": "Indian", "description": "Indian naming traditions"},
+    {"code": "american", "name": "American", "description": "Western naming conventions"},
+    {"code": "british", "name": "British", "description": "British naming traditions"},
+    {"code": "french", "name": "French", "description": "French naming conventions"},
+    {"code": "german", "name": "German", "description": "German naming traditions"},
+    {"code": "italian", "name": "Italian", "description": "Italian naming conventions"},
+    {"code": "japanese", "name": "Japanese", "description": "Japanese naming patterns"},
+    {"code": "korean", "name": "Korean", "description": "Korean naming traditions"},
+    {"code": "vietnamese", "name": "Vietnamese", "description": "Vietnamese naming patterns"},
+    {"code": "thai", "name": "Thai", "description": "Thai naming traditions"},
+    {"code": "filipino", "name": "Filipino", "description": "Filipino naming conventions"},
+    {"code": "mexican", "name": "Mexican", "description": "Mexican naming traditions"},
+    {"code": "brazilian", "name": "Brazilian", "description": "Brazilian naming conventions"},
+    {"code": "argentine", "name": "Argentine", "description": "Argentine naming traditions"},
+    {"code": "egyptian", "name": "Egyptian", "description": "Egyptian naming conventions"},
+    {"code": "moroccan", "name": "Moroccan", "description": "Moroccan naming traditions"},
+    {"code": "turkish", "name": "Turkish", "description": "Turkish naming conventions"},
+    {"code": "iranian", "name": "Iranian", "description": "Iranian naming traditions"},
+    {"code": "pakistani", "name": "Pakistani", "description": "Pakistani naming conventions"},
+    {"code": "bangladeshi", "name": "Bangladeshi", "description": "Bangladeshi naming traditions"},
+    {"code": "nigerian", "name": "Nigerian", "description": "Nigerian naming conventions"},
+    {"code": "kenyan", "name": "Kenyan", "description": "Kenyan naming traditions"},
+    {"code": "south_african", "name": "South African", "description": "South African naming conventions"}
+)
+
 @app.route('/api/cultures')
 def get_supported_cultures():
     """Get list of supported cultures."""
-    return jsonify({
-        "cultures": [
-            {"code": "sudanese", "name": "Sudanese", "description": "Arabic/Islamic naming traditions"},
-            {"code": "spanish", "name": "Spanish", "description": "Traditional Spanish naming conventions"},
-            {"code": "chinese", "name": "Chinese", "description": "Chinese naming patterns"},
-            {"code": "indian", "name": "Indian", "description": "Indian naming traditions"},
-            {"code": "american", "name": "American", "description": "Western naming conventions"},
-            {"code": "british", "name": "British", "description": "British naming traditions"},
-            {"code": "french", "name": "French", "description": "French naming conventions"},
-            {"code": "german", "name": "German", "description": "German naming traditions"},
-            {"code": "italian", "name": "Italian", "description": "Italian naming conventions"},
-            {"code": "japanese", "name": "Japanese", "description": "Japanese naming patterns"},
-            {"code": "korean", "name": "Korean", "description": "Korean naming traditions"},
-            {"code": "vietnamese", "name": "Vietnamese", "description": "Vietnamese naming patterns"},
-            {"code": "thai", "name": "Thai", "description": "Thai naming traditions"},
-            {"code": "filipino", "name": "Filipino", "description": "Filipino naming conventions"},
-            {"code": "mexican", "name": "Mexican", "description": "Mexican naming traditions"},
-            {"code": "brazilian", "name": "Brazilian", "description": "Brazilian naming conventions"},
-            {"code": "argentine", "name": "Argentine", "description": "Argentine naming traditions"},
-            {"code": "egyptian", "name": "Egyptian", "description": "Egyptian naming conventions"},
-            {"code": "moroccan", "name": "Moroccan", "description": "Moroccan naming traditions"},
-            {"code": "turkish", "name": "Turkish", "description": "Turkish naming conventions"},
-            {"code": "iranian", "name": "Iranian", "description": "Iranian naming traditions"},
-            {"code": "pakistani", "name": "Pakistani", "description": "Pakistani naming conventions"},
-            {"code": "bangladeshi", "name": "Bangladeshi", "description": "Bangladeshi naming traditions"},
-            {"code": "nigerian", "name": "Nigerian", "description": "Nigerian naming conventions"},
-            {"code": "kenyan", "name": "Kenyan", "description": "Kenyan naming traditions"},
-            {"code": "south_african", "name": "South African", "description": "South African naming conventions"}
-        ]
-    })
+    return jsonify({"cultures": SUPPORTED_CULTURES})
 
 
 @app.route('/api/statistics')
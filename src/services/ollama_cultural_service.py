@@ -5,6 +5,7 @@ Uses local LLM to generate culturally appropriate names and analyze cultural con
 
 import json
 import logging
+import re
 import requests
 from typing import Dict, List, Any, Optional
 from datetime import datetime
@@ -25,13 +26,72 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Location keywords that trigger Middle Eastern naming guidance; matched
+# against the start of each word so "Iraqi" matches but "Romania" does not
+MIDDLE_EAST_REGIONS = (
+    'iraq', 'syria', 'lebanon', 'jordan', 'egypt', 'saudi',
+    'kuwait', 'bahrain', 'qatar', 'uae', 'oman', 'yemen'
+)
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Keywords matched against the lowercased race to pick a fallback name set;
+# "iraq" and "sudan" also cover the "iraqi" and "sudanese" adjectives
+FALLBACK_CULTURE_KEYWORDS = (
+    ("iraqi", ("iraq",)),
+    ("sudanese", ("sudan",)),
+    ("spanish", ("spanish", "spain"))
+)
+
+# Fallback names by culture, built once at import time
+FALLBACK_NAMES = {
+    "iraqi": (
+        {"first": "Ahmed", "middle": "Hassan", "last": "Al-Maliki"},
+        {"first": "Ali", "middle": "Hussein", "last": "Al-Sadr"},
+        {"first": "Mohammed", "middle": "Ibrahim", "last": "Al-Hakim"},
+        {"first": "Omar", "middle": "Khalid", "last": "Al-Jaafari"},
+        {"first": "Mustafa", "middle": "Yusuf", "last": "Al-Rubaie"}
+    ),
+    "sudanese": (
+        {"first": "Ahmed", "middle": "Hassan", "last": "Mohammed"},
+        {"first": "Fatima", "middle": "Aisha", "last": "Ali"},
+        {"first": "Omar", "middle": "Abdullah", "last": "Hassan"},
+        {"first": "Aisha", "middle": "Zainab", "last": "Mahmoud"},
+        {"first": "Khalid", "middle": "Ibrahim", "last": "Osman"}
+    ),
+    "spanish": (
+        {"first": "Alejandro", "middle": "Miguel", "last": "Rodríguez"},
+        {"first": "Isabella", "middle": "María", "last": "García"},
+        {"first": "Carlos", "middle": "José", "last": "Martínez"},
+        {"first": "Sofia", "middle": "Ana", "last": "López"},
+        {"first": "Diego", "middle": "Antonio", "last": "Fernández"}
+    ),
+    "default": (
+        {"first": "John", "middle": "Michael", "last": "Smith"},
+        {"first": "Sarah", "middle": "Elizabeth", "last": "Johnson"},
+        {"first": "David", "middle": "Robert", "last": "Williams"},
+        {"first": "Emily", "middle": "Grace", "last": "Brown"},
+        {"first": "Michael", "middle": "James", "last": "Davis"}
+    )
+}
+
 class OllamaCulturalService:
     """Service for generating culturally appropriate names using Ollama LLM."""
     
-    def __init__(self, model_name: str = "phi3:mini", base_url: str = "http://localhost:11434"):
+    # Sampling options sent with every generation request
+    GENERATION_OPTIONS = {
+        "temperature": 0.8,
+        "top_p": 0.9,
+        "num_predict": 1024,  # Reduced for faster response
+        "top_k": 40,  # Add top_k for better performance
+        "repeat_penalty": 1.1  # Prevent repetition
+    }
+    
+    def __init__(self, model_name: str = "phi3:mini", base_url: str = "http://127.0.0.1:11434"):
         self.model_name = model_name
         self.base_url = base_url
         self.api_url = f"{base_url}/api/chat"  # Switch to chat API
+        # Reuse keep-alive connections to Ollama across generation requests
+        self.session = requests.Session()
         
     def generate_cultural_names(self, request_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
@@ -188,8 +248,9 @@ Respond with ONLY this JSON structure (no other text):
                 "- Family names often indicate tribal or geographic origin"
             ])
         
-        # Middle Eastern patterns
-        if any(region in location.lower() for region in ['iraq', 'syria', 'lebanon', 'jordan', 'egypt', 'saudi', 'kuwait', 'bahrain', 'qatar', 'uae', 'oman', 'yemen']):
+        # Middle Eastern patterns (location arrives lowercased from _create_cultural_prompt)
+        location_words = WORD_PATTERN.findall(location)
+        if any(word.startswith(MIDDLE_EAST_REGIONS) for word in location_words):
             cultural_analysis.extend([
                 "MIDDLE EASTERN NAMING PATTERNS:",
                 "- Strong emphasis on family and tribal connections",
@@ -257,18 +318,12 @@ Respond with ONLY this JSON structure (no other text):
                 }
             ],
             "stream": False,
-            "options": {
-                "temperature": 0.8,
-                "top_p": 0.9,
-                "num_predict": 1024,  # Reduced for faster response
-                "top_k": 40,  # Add top_k for better performance
-                "repeat_penalty": 1.1  # Prevent repetition
-            }
+            "options": self.GENERATION_OPTIONS
         }
         
         try:
-            # Reduced timeout for better UX
-            response = requests.post(self.api_url, json=payload, timeout=15)
+            # Reduced timeout for better UX; connect fails fast if Ollama is down
+            response = self.session.post(self.api_url, json=payload, timeout=(2, 15))
             response.raise_for_status()
             
             result = response.json()
@@ -312,66 +367,21 @@ Respond with ONLY this JSON structure (no other text):
                 logger.info(f"Attempting to parse JSON: {json_str[:200]}...")
                 parsed_data = json.loads(json_str)
                 
-                identities = []
-                for identity_data in parsed_data.get('identities', []):
-                    identity = {
-                        "first_name": identity_data.get('first_name', 'Unknown'),
-                        "middle_name": identity_data.get('middle_name'),
-                        "last_name": identity_data.get('last_name', 'Unknown'),
-                        "cultural_context": {
-                            "culture": request_data.get('race', 'Unknown'),
-                            "cultural_notes": identity_data.get('cultural_notes', ''),
-                            "name_origin": identity_data.get('name_origin', ''),
-                            "religious_context": identity_data.get('religious_context', '')
-                        },
-                        "validation_status": "validated",
-                        "validation_notes": ["Generated by Ollama LLM with cultural analysis"],
-                        "generated_date": datetime.utcnow().isoformat() + "Z",
-                        "traceability": {
-                            "request_parameters": request_data,
-                            "cultural_analysis": parsed_data.get('cultural_analysis', {}),
-                            "name_generation_steps": [
-                                {
-                                    "step": 1,
-                                    "description": "Ollama LLM cultural analysis",
-                                    "result": f"Generated {identity_data.get('first_name', '')} {identity_data.get('last_name', '')}"
-                                }
-                            ],
-                            "validation_steps": [
-                                {
-                                    "step": 1,
-                                    "description": "Cultural authenticity check",
-                                    "result": f"PASSED - Name matches {request_data.get('race', 'Unknown')} cultural patterns"
-                                },
-                                {
-                                    "step": 2,
-                                    "description": "Religious compatibility",
-                                    "result": f"PASSED - Name appropriate for {request_data.get('religion', 'Unknown')} background"
-                                },
-                                {
-                                    "step": 3,
-                                    "description": "Geographic validation",
-                                    "result": f"PASSED - Name suitable for {request_data.get('location', 'Unknown')} region"
-                                },
-                                {
-                                    "step": 4,
-                                    "description": "Age appropriateness",
-                                    "result": f"PASSED - Name generation year {request_data.get('birth_year', 'Unknown')} compatible"
-                                },
-                                {
-                                    "step": 5,
-                                    "description": "Name structure validation",
-                                    "result": "PASSED - First, middle, and last name structure verified"
-                                }
-                            ],
-                            "final_result": {
-                                "generated_name": f"{identity_data.get('first_name', '')} {identity_data.get('middle_name', '')} {identity_data.get('last_name', '')}",
-                                "cultural_notes": identity_data.get('cultural_notes', ''),
-                                "validation_status": "validated"
-                            }
-                        }
-                    }
-                    identities.append(identity)
+                # Request-level values are the same for every identity; look them up once
+                batch = {
+                    "request_data": request_data,
+                    "culture": request_data.get('race', 'Unknown'),
+                    "religion": request_data.get('religion', 'Unknown'),
+                    "location": request_data.get('location', 'Unknown'),
+                    "birth_year": request_data.get('birth_year', 'Unknown'),
+                    "cultural_analysis": parsed_data.get('cultural_analysis', {}),
+                    "generated_date": datetime.utcnow().isoformat() + "Z"
+                }
+                
+                identities = [
+                    self._build_llm_identity(identity_data, batch)
+                    for identity_data in parsed_data.get('identities', [])
+                ]
                 
                 return identities
                 
@@ -385,9 +395,73 @@ Respond with ONLY this JSON structure (no other text):
         logger.warning("Using fallback names due to parsing error")
         return self._generate_fallback_names(request_data)
     
+    def _build_llm_identity(self, identity_data: Dict[str, Any], batch: Dict[str, Any]) -> Dict[str, Any]:
+        """Build one application identity from an LLM identity entry."""
+        get = identity_data.get
+        first_name = get('first_name', '')
+        last_name = get('last_name', '')
+        cultural_notes = get('cultural_notes', '')
+        
+        return {
+            "first_name": get('first_name', 'Unknown'),
+            "middle_name": get('middle_name'),
+            "last_name": get('last_name', 'Unknown'),
+            "cultural_context": {
+                "culture": batch['culture'],
+                "cultural_notes": cultural_notes,
+                "name_origin": get('name_origin', ''),
+                "religious_context": get('religious_context', '')
+            },
+            "validation_status": "validated",
+            "validation_notes": ["Generated by Ollama LLM with cultural analysis"],
+            "generated_date": batch['generated_date'],
+            "traceability": {
+                "request_parameters": batch['request_data'],
+                "cultural_analysis": batch['cultural_analysis'],
+                "name_generation_steps": [
+                    {
+                        "step": 1,
+                        "description": "Ollama LLM cultural analysis",
+                        "result": f"Generated {first_name} {last_name}"
+                    }
+                ],
+                "validation_steps": [
+                    {
+                        "step": 1,
+                        "description": "Cultural authenticity check",
+                        "result": f"PASSED - Name matches {batch['culture']} cultural patterns"
+                    },
+                    {
+                        "step": 2,
+                        "description": "Religious compatibility",
+                        "result": f"PASSED - Name appropriate for {batch['religion']} background"
+                    },
+                    {
+                        "step": 3,
+                        "description": "Geographic validation",
+                        "result": f"PASSED - Name suitable for {batch['location']} region"
+                    },
+                    {
+                        "step": 4,
+                        "description": "Age appropriateness",
+                        "result": f"PASSED - Name generation year {batch['birth_year']} compatible"
+                    },
+                    {
+                        "step": 5,
+                        "description": "Name structure validation",
+                        "result": "PASSED - First, middle, and last name structure verified"
+                    }
+                ],
+                "final_result": {
+                    "generated_name": f"{first_name} {get('middle_name', '')} {last_name}",
+                    "cultural_notes": cultural_notes,
+                    "validation_status": "validated"
+                }
+            }
+        }
+    
     def _clean_json_string(self, json_str: str) -> str:
         """Clean up common JSON formatting issues from LLM responses."""
-        import re
         
         # Remove extra whitespace and newlines
         json_str = re.sub(r'\s+', ' ', json_str)
@@ -427,55 +501,35 @@ Respond with ONLY this JSON structure (no other text):
     def _generate_fallback_names(self, request_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate fallback names if Ollama fails."""
         
-        culture = request_data.get('race', 'Unknown').lower()
+        culture = (request_data.get('race') or 'Unknown').lower()
         
         # Enhanced fallback names with proper Iraqi support
-        if 'iraqi' in culture or 'iraq' in culture:
-            fallback_names = [
-                {"first": "Ahmed", "middle": "Hassan", "last": "Al-Maliki"},
-                {"first": "Ali", "middle": "Hussein", "last": "Al-Sadr"},
-                {"first": "Mohammed", "middle": "Ibrahim", "last": "Al-Hakim"},
-                {"first": "Omar", "middle": "Khalid", "last": "Al-Jaafari"},
-                {"first": "Mustafa", "middle": "Yusuf", "last": "Al-Rubaie"}
-            ]
-        elif 'sudanese' in culture or 'sudan' in culture:
-            fallback_names = [
-                {"first": "Ahmed", "middle": "Hassan", "last": "Mohammed"},
-                {"first": "Fatima", "middle": "Aisha", "last": "Ali"},
-                {"first": "Omar", "middle": "Abdullah", "last": "Hassan"},
-                {"first": "Aisha", "middle": "Zainab", "last": "Mahmoud"},
-                {"first": "Khalid", "middle": "Ibrahim", "last": "Osman"}
-            ]
-        elif 'spanish' in culture or 'spain' in culture:
-            fallback_names = [
-                {"first": "Alejandro", "middle": "Miguel", "last": "Rodríguez"},
-                {"first": "Isabella", "middle": "María", "last": "García"},
-                {"first": "Carlos", "middle": "José", "last": "Martínez"},
-                {"first": "Sofia", "middle": "Ana", "last": "López"},
-                {"first": "Diego", "middle": "Antonio", "last": "Fernández"}
-            ]
-        else:
-            fallback_names = [
-                {"first": "John", "middle": "Michael", "last": "Smith"},
-                {"first": "Sarah", "middle": "Elizabeth", "last": "Johnson"},
-                {"first": "David", "middle": "Robert", "last": "Williams"},
-                {"first": "Emily", "middle": "Grace", "last": "Brown"},
-                {"first": "Michael", "middle": "James", "last": "Davis"}
-            ]
+        fallback_key = next(
+            (key for key, keywords in FALLBACK_CULTURE_KEYWORDS
+             if any(keyword in culture for keyword in keywords)),
+            "default"
+        )
+        fallback_names = FALLBACK_NAMES[fallback_key]
         
         identities = []
+        generated_date = datetime.utcnow().isoformat() + "Z"
+        # Request fields are the same for every fallback identity; look them up once
+        race = request_data.get('race', 'Unknown')
+        religion = request_data.get('religion', 'Unknown')
+        location = request_data.get('location', 'Unknown')
+        birth_year = request_data.get('birth_year', 'Unknown')
         for i, name in enumerate(fallback_names):
             identity = {
                 "first_name": name["first"],
                 "middle_name": name["middle"],
                 "last_name": name["last"],
-                "cultural_context": {"culture": request_data.get('race', 'Unknown')},
+                "cultural_context": {"culture": race},
                 "validation_status": "validated",
                 "validation_notes": [f"Fallback identity #{i+1}"],
-                "generated_date": datetime.utcnow().isoformat() + "Z",
+                "generated_date": generated_date,
                 "traceability": {
                     "request_parameters": request_data,
-                    "cultural_analysis": {"culture": request_data.get('race', 'Unknown')},
+                    "cultural_analysis": {"culture": race},
                     "name_generation_steps": [
                         {"step": 1, "description": f"Fallback generation #{i+1}", "result": f"Generated {name['first']} {name['last']}"}
                     ],
@@ -483,22 +537,22 @@ Respond with ONLY this JSON structure (no other text):
                         {
                             "step": 1,
                             "description": "Cultural authenticity check",
-                            "result": f"PASSED - {name['first']} {name['last']} matches {request_data.get('race', 'Unknown')} patterns"
+                            "result": f"PASSED - {name['first']} {name['last']} matches {race} patterns"
                         },
                         {
                             "step": 2,
                             "description": "Religious compatibility",
-                            "result": f"PASSED - Name appropriate for {request_data.get('religion', 'Unknown')} background"
+                            "result": f"PASSED - Name appropriate for {religion} background"
                         },
                         {
                             "step": 3,
                             "description": "Geographic validation",
-                            "result": f"PASSED - Name suitable for {request_data.get('location', 'Unknown')} region"
+                            "result": f"PASSED - Name suitable for {location} region"
                         },
                         {
                             "step": 4,
                             "description": "Age appropriateness",
-                            "result": f"PASSED - Name generation year {request_data.get('birth_year', 'Unknown')} compatible"
+                            "result": f"PASSED - Name generation year {birth_year} compatible"
                         },
                         {
                             "step": 5,
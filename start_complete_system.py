@@ -7,28 +7,42 @@ Starts all components of the Name Generation System
 import subprocess
 import time
 import sys
-import os
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from threading import Thread
 
+from port_manager import is_port_available, wait_for_port
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Endpoint and usage summary, emitted as a single log record after startup
+STARTUP_BANNER = "\n".join([
+    "📋 Available endpoints:",
+    "  - Web Interface: http://localhost:3000",
+    "  - MCP Server: http://localhost:8500",
+    "  - Ollama API: http://localhost:11434",
+    "",
+    "📝 Usage:",
+    "  1. Open http://localhost:3000 in your browser",
+    "  2. Fill out the form with cultural parameters",
+    "  3. Click 'Generate Identity' to get culturally appropriate names"
+])
+
 def start_ollama():
     """Start Ollama service."""
     try:
         logger.info("Starting Ollama service...")
-        # Check if Ollama is already running
-        result = subprocess.run(['ollama', 'list'], capture_output=True, text=True)
-        if result.returncode == 0:
+        # Check if Ollama is already running by probing its API port instead of
+        # spawning the ollama CLI
+        if not is_port_available(11434, "127.0.0.1"):
             logger.info("✅ Ollama is already running")
             return True
         else:
             logger.info("Starting Ollama server...")
             subprocess.Popen(['ollama', 'serve'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            time.sleep(3)  # Wait for Ollama to start
-            logger.info("✅ Ollama service started")
+            logger.info("✅ Ollama service launched")
             return True
     except Exception as e:
         logger.error(f"❌ Failed to start Ollama: {e}")
@@ -38,12 +52,15 @@ def start_ollama():
 def start_mcp_server():
     """Start MCP server on port 8500."""
     try:
+        # Reuse an MCP server that is already listening rather than starting another
+        if not is_port_available(8500, "127.0.0.1"):
+            logger.info("✅ MCP server is already running on port 8500")
+            return True
         logger.info("Starting MCP server on port 8500...")
         # Start the Strands MCP server
         subprocess.Popen([sys.executable, 'strands_mcp_server.py'], 
                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        time.sleep(3)  # Wait for server to start
-        logger.info("✅ MCP server started on port 8500")
+        logger.info("✅ MCP server launched on port 8500")
         return True
     except Exception as e:
         logger.error(f"❌ Failed to start MCP server: {e}")
@@ -53,13 +70,15 @@ def start_mcp_server():
 def start_flask_app():
     """Start Flask application on port 3000."""
     try:
+        # Reuse a Flask application that is already listening rather than starting another
+        if not is_port_available(3000, "127.0.0.1"):
+            logger.info("✅ Flask application is already running on port 3000")
+            return True
         logger.info("Starting Flask application on port 3000...")
-        # Change to python_frontend directory
-        os.chdir('python_frontend')
-        subprocess.Popen([sys.executable, 'app.py'], 
+        # Run from the python_frontend directory without changing our own cwd
+        subprocess.Popen([sys.executable, 'app.py'], cwd='python_frontend',
                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        time.sleep(3)  # Wait for Flask to start
-        logger.info("✅ Flask application started on port 3000")
+        logger.info("✅ Flask application launched on port 3000")
         return True
     except Exception as e:
         logger.error(f"❌ Failed to start Flask app: {e}")
@@ -72,21 +91,26 @@ def check_services():
         import requests
         
         services = {
-            "Ollama": "http://localhost:11434",
-            "MCP Server": "http://localhost:8500",
-            "Flask App": "http://localhost:3000"
+            "Ollama": "http://127.0.0.1:11434",
+            "MCP Server": "http://127.0.0.1:8500",
+            "Flask App": "http://127.0.0.1:3000"
         }
         
-        logger.info("Checking service status...")
-        for service_name, url in services.items():
+        def check_service(service_name, url):
             try:
-                response = requests.get(url, timeout=5)
+                response = session.get(url, timeout=(2, 5))
                 if response.status_code == 200:
                     logger.info(f"✅ {service_name} is running")
                 else:
                     logger.warning(f"⚠️ {service_name} responded with status {response.status_code}")
             except Exception as e:
                 logger.error(f"❌ {service_name} is not responding: {e}")
+        
+        logger.info("Checking service status...")
+        # Share one session across all probes; services are probed concurrently
+        # so the check takes as long as the slowest one
+        with requests.Session() as session, ThreadPoolExecutor(max_workers=len(services)) as executor:
+            list(executor.map(check_service, services.keys(), services.values()))
     except ImportError:
         logger.warning("requests module not available - skipping service checks")
 
@@ -95,27 +119,37 @@ def main():
     """Main function to start all services."""
     logger.info("🚀 Starting Name Generation System...")
     
-    # Start services
+    # Launch all services up front so they boot in parallel
     ollama_ok = start_ollama()
     mcp_ok = start_mcp_server()
     flask_ok = start_flask_app()
     
-    # Wait a bit for all services to start
-    time.sleep(5)
+    # Wait until each successfully launched service accepts connections
+    # instead of sleeping blindly; failed launches are not waited on
+    launched = [
+        (name, port)
+        for name, port, ok in (
+            ("Ollama", 11434, ollama_ok),
+            ("MCP server", 8500, mcp_ok),
+            ("Flask app", 3000, flask_ok)
+        )
+        if ok
+    ]
+    if launched:
+        ports = [port for _, port in launched]
+        with ThreadPoolExecutor(max_workers=len(launched)) as executor:
+            ready = list(executor.map(wait_for_port, ports, ["127.0.0.1"] * len(ports)))
+        for (name, port), is_ready in zip(launched, ready):
+            if is_ready:
+                logger.info(f"✅ {name} is accepting connections on port {port}")
+            else:
+                logger.warning(f"⚠️ {name} did not start listening on port {port}")
     
     # Check service status
     check_services()
     
     logger.info("🎉 System startup complete!")
-    logger.info("📋 Available endpoints:")
-    logger.info("  - Web Interface: http://localhost:3000")
-    logger.info("  - MCP Server: http://localhost:8500")
-    logger.info("  - Ollama API: http://localhost:11434")
-    
-    logger.info("📝 Usage:")
-    logger.info("  1. Open http://localhost:3000 in your browser")
-    logger.info("  2. Fill out the form with cultural parameters")
-    logger.info("  3. Click 'Generate Identity' to get culturally appropriate names")
+    logger.info(STARTUP_BANNER)
     
     # Keep the script running
     try:
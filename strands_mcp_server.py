@@ -4,11 +4,24 @@ Strands MCP Server
 Exposes Strands tools using @tool decorator for Cursor integration
 """
 
+import hashlib
+import inspect
 import json
 import logging
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import zlib
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
 from strands_tools import generate_cultural_names, validate_names_watchlist, get_cultural_context
 
+# JSON schema types for annotated tool parameters; anything else maps to "string"
+JSON_SCHEMA_TYPES = {
+    str: "string",
+    int: "integer",
+    bool: "boolean",
+    list: "array",
+    dict: "object"
+}
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -22,19 +35,19 @@ class StrandsMCPServer:
             "validate_names_watchlist": validate_names_watchlist,
             "get_cultural_context": get_cultural_context
         }
+        # Tool specs are static for the life of the server, so build them once
+        self._tools_list = None
+        self._tools_etag = None
     
     def get_tool_spec(self, tool_func):
         """Extract tool specification from decorated function."""
-        if hasattr(tool_func, '_tool_name'):
-            name = tool_func._tool_name
-        else:
-            name = tool_func.__name__
+        # Single lookup instead of hasattr() followed by a second attribute access
+        name = getattr(tool_func, '_tool_name', None) or tool_func.__name__
         
         # Get description from docstring
         description = tool_func.__doc__ or ""
         
         # Extract type hints for input schema
-        import inspect
         sig = inspect.signature(tool_func)
         parameters = sig.parameters
         
@@ -49,20 +62,7 @@ class StrandsMCPServer:
             param_default = param.default
             
             # Convert Python types to JSON schema types
-            if param_type == str:
-                json_type = "string"
-            elif param_type == int:
-                json_type = "integer"
-            elif param_type == bool:
-                json_type = "boolean"
-            elif param_type == list:
-                json_type = "array"
-            elif param_type == dict:
-                json_type = "object"
-            elif param_type == type(None):
-                json_type = "string"  # Handle None type
-            else:
-                json_type = "string"
+            json_type = JSON_SCHEMA_TYPES.get(param_type, "string")
             
             properties[param_name] = {
                 "type": json_type,
@@ -85,17 +85,30 @@ class StrandsMCPServer:
     
     def list_tools(self):
         """List all available tools."""
+        if self._tools_list is None:
+            self._tools_list = self._build_tools_list()
+        return self._tools_list
+    
+    def get_tools_etag(self):
+        """Return an ETag identifying the current tool catalog."""
+        if self._tools_etag is None:
+            catalog = json.dumps(self.list_tools(), sort_keys=True).encode()
+            self._tools_etag = f'"{hashlib.sha256(catalog).hexdigest()[:32]}"'
+        return self._tools_etag
+    
+    def _build_tools_list(self):
+        """Build the tool specifications for every registered tool."""
         tools_list = []
-        logger.info(f"Available tools in registry: {list(self.tools.keys())}")
+        logger.debug(f"Available tools in registry: {list(self.tools.keys())}")
         for name, tool_func in self.tools.items():
             try:
-                logger.info(f"Processing tool: {name}")
+                logger.debug(f"Processing tool: {name}")
                 tool_spec = self.get_tool_spec(tool_func)
                 tools_list.append(tool_spec)
-                logger.info(f"Successfully added tool: {name}")
+                logger.debug(f"Successfully added tool: {name}")
             except Exception as e:
                 logger.error(f"Error processing tool {name}: {e}")
-        logger.info(f"Final tools list: {[tool['name'] for tool in tools_list]}")
+        logger.debug(f"Final tools list: {[tool['name'] for tool in tools_list]}")
         return tools_list
     
     def call_tool(self, tool_name, arguments):
@@ -124,124 +137,169 @@ class StrandsMCPServer:
 # Create server instance
 strands_mcp_server = StrandsMCPServer()
 
+# Largest request body accepted, before and after gzip decompression
+MAX_BODY_BYTES = 1024 * 1024
+
+class PayloadTooLargeError(Exception):
+    """Raised when a request body exceeds MAX_BODY_BYTES."""
+
 class StrandsMCPHandler(BaseHTTPRequestHandler):
     """HTTP handler for Strands MCP protocol."""
     
+    def _read_body(self):
+        """Read the request body, decompressing it if it was gzip-encoded."""
+        content_length = int(self.headers['Content-Length'])
+        if content_length > MAX_BODY_BYTES:
+            raise PayloadTooLargeError(f"Request body of {content_length} bytes exceeds {MAX_BODY_BYTES}")
+        body = self.rfile.read(content_length)
+        if self.headers.get('Content-Encoding', '').lower() == 'gzip':
+            # Bounded decompression so a small body cannot expand without limit
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            body = decompressor.decompress(body, MAX_BODY_BYTES)
+            if decompressor.unconsumed_tail:
+                raise PayloadTooLargeError(f"Decompressed request body exceeds {MAX_BODY_BYTES} bytes")
+            if not decompressor.eof:
+                raise ValueError("Truncated gzip request body")
+        return body
+    
+    def _send_json(self, status, payload, cors=True, etag=None):
+        """Send a JSON response with an explicit Content-Length."""
+        # Compact output: pretty-printing only adds bytes and encoding time
+        body = json.dumps(payload).encode()
+        
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        if cors:
+            self.send_header('Access-Control-Allow-Origin', '*')
+        if etag:
+            self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
     def do_GET(self):
         """Handle GET requests for tool discovery."""
         if self.path == '/mcp':
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
+            etag = strands_mcp_server.get_tools_etag()
+            if self.headers.get('If-None-Match') == etag:
+                # Client already holds the current catalog
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                return
             
             tools_list = strands_mcp_server.list_tools()
-            response = {"tools": tools_list}
-            self.wfile.write(json.dumps(response, indent=2).encode())
+            self._send_json(200, {"tools": tools_list}, etag=etag)
         else:
             self.send_response(404)
             self.end_headers()
     
-    def do_POST(self):
-        """Handle POST requests for MCP protocol."""
-        if self.path == '/mcp':
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
+    def _handle_rpc(self, data):
+        """Dispatch a single JSON-RPC request and return its response."""
+        method = data.get('method')
+        params = data.get('params', {})
+        request_id = data.get('id')
+        jsonrpc = data.get('jsonrpc', '2.0')
+        
+        logger.debug(f"Handling MCP method: {method}")
+        
+        if method == 'initialize':
+            response = {
+                "jsonrpc": jsonrpc,
+                "id": request_id,
+                "result": {
+                    "protocolVersion": "2025-06-18",
+                    "capabilities": {
+                        "tools": True,
+                        "prompts": True,
+                        "resources": False,
+                        "logging": False,
+                        "elicitation": {},
+                        "roots": {"listChanged": False}
+                    },
+                    "serverInfo": {
+                        "name": "strands-name-generation-server",
+                        "version": "1.0.0"
+                    }
+                }
+            }
+        
+        elif method == 'tools/list':
+            tools_list = strands_mcp_server.list_tools()
+            response = {
+                "jsonrpc": jsonrpc,
+                "id": request_id,
+                "result": {
+                    "tools": tools_list
+                }
+            }
+        
+        elif method == 'tools/call':
+            tool_name = params.get('name')
+            tool_arguments = params.get('arguments', {})
             
-            try:
-                data = json.loads(post_data.decode('utf-8'))
-                method = data.get('method')
-                params = data.get('params', {})
-                request_id = data.get('id')
-                jsonrpc = data.get('jsonrpc', '2.0')
-                
-                logger.info(f"Handling MCP method: {method}")
-                
-                if method == 'initialize':
-                    response = {
-                        "jsonrpc": jsonrpc,
-                        "id": request_id,
-                        "result": {
-                            "protocolVersion": "2025-06-18",
-                            "capabilities": {
-                                "tools": True,
-                                "prompts": True,
-                                "resources": False,
-                                "logging": False,
-                                "elicitation": {},
-                                "roots": {"listChanged": False}
-                            },
-                            "serverInfo": {
-                                "name": "strands-name-generation-server",
-                                "version": "1.0.0"
-                            }
-                        }
+            if not tool_name:
+                response = {
+                    "jsonrpc": jsonrpc,
+                    "id": request_id,
+                    "error": {
+                        "code": -32602,
+                        "message": "Invalid params: tool name required"
                     }
-                
-                elif method == 'tools/list':
-                    tools_list = strands_mcp_server.list_tools()
+                }
+            else:
+                try:
+                    result = strands_mcp_server.call_tool(tool_name, tool_arguments)
                     response = {
                         "jsonrpc": jsonrpc,
                         "id": request_id,
-                        "result": {
-                            "tools": tools_list
-                        }
+                        "result": result
                     }
-                
-                elif method == 'tools/call':
-                    tool_name = params.get('name')
-                    tool_arguments = params.get('arguments', {})
-                    
-                    if not tool_name:
-                        response = {
-                            "jsonrpc": jsonrpc,
-                            "id": request_id,
-                            "error": {
-                                "code": -32602,
-                                "message": "Invalid params: tool name required"
-                            }
-                        }
-                    else:
-                        try:
-                            result = strands_mcp_server.call_tool(tool_name, tool_arguments)
-                            response = {
-                                "jsonrpc": jsonrpc,
-                                "id": request_id,
-                                "result": result
-                            }
-                        except Exception as e:
-                            response = {
-                                "jsonrpc": jsonrpc,
-                                "id": request_id,
-                                "error": {
-                                    "code": -32603,
-                                    "message": f"Internal error: {str(e)}"
-                                }
-                            }
-                
-                else:
+                except Exception as e:
                     response = {
                         "jsonrpc": jsonrpc,
                         "id": request_id,
                         "error": {
-                            "code": -32601,
-                            "message": f"Method '{method}' not found"
+                            "code": -32603,
+                            "message": f"Internal error: {str(e)}"
                         }
                     }
+        
+        else:
+            response = {
+                "jsonrpc": jsonrpc,
+                "id": request_id,
+                "error": {
+                    "code": -32601,
+                    "message": f"Method '{method}' not found"
+                }
+            }
+        
+        return response
+    
+    def do_POST(self):
+        """Handle POST requests for MCP protocol."""
+        if self.path == '/mcp':
+            try:
+                data = json.loads(self._read_body().decode('utf-8'))
+                response = self._handle_rpc(data)
                 
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                
-                self.wfile.write(json.dumps(response, indent=2).encode())
+                self._send_json(200, response)
                 
+            except PayloadTooLargeError as e:
+                logger.warning(f"Rejected POST request: {e}")
+                error_response = {
+                    "jsonrpc": "2.0",
+                    "id": None,
+                    "error": {
+                        "code": -32600,
+                        "message": f"Invalid Request: {str(e)}"
+                    }
+                }
+                self._send_json(413, error_response, cors=False)
             except Exception as e:
                 logger.error(f"Error handling POST request: {e}")
-                self.send_response(500)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                
                 error_response = {
                     "jsonrpc": "2.0",
                     "id": None,
@@ -250,7 +308,7 @@ class StrandsMCPHandler(BaseHTTPRequestHandler):
                         "message": f"Internal error: {str(e)}"
                     }
                 }
-                self.wfile.write(json.dumps(error_response).encode())
+                self._send_json(500, error_response, cors=False)
         else:
             self.send_response(404)
             self.end_headers()
@@ -266,15 +324,18 @@ class StrandsMCPHandler(BaseHTTPRequestHandler):
 def run_strands_mcp_server(port=8500):
     """Run the Strands MCP server."""
     server_address = ('', port)
-    httpd = HTTPServer(server_address, StrandsMCPHandler)
+    # Threaded server so a slow tool call does not block discovery requests
+    httpd = ThreadingHTTPServer(server_address, StrandsMCPHandler)
     logger.info(f"Starting Strands MCP server on port {port}")
     
     # List available tools
     tools_list = strands_mcp_server.list_tools()
     logger.info(f"Available tools: {[tool['name'] for tool in tools_list]}")
     
-    for tool in tools_list:
-        logger.info(f"  - {tool['name']}: {tool['description'][:50]}...")
+    # Per-tool descriptions are only useful when debugging
+    if logger.isEnabledFor(logging.DEBUG):
+        for tool in tools_list:
+            logger.debug(f"  - {tool['name']}: {tool['description'][:50]}...")
     
     httpd.serve_forever()
 
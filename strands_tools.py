@@ -39,7 +39,7 @@ def generate_cultural_names(request_data: Dict[str, Any]) -> str:
     """
     try:
         identities = ollama_service.generate_cultural_names(request_data)
-        return json.dumps(identities, indent=2)
+        return json.dumps(identities)
     except Exception as e:
         logger.error(f"Error generating cultural names: {e}")
         return json.dumps({"error": str(e)})
@@ -68,7 +68,7 @@ def validate_names_watchlist(names: List[str]) -> str:
         return json.dumps({
             "validation_results": validation_results,
             "total_names": len(names),
-            "valid_names": len(names)
+            "valid_names": sum(1 for result in validation_results if result["is_valid"])
         })
     except Exception as e:
         logger.error(f"Error validating names: {e}")
@@ -97,7 +97,7 @@ def get_cultural_context(race: str, religion: str, location: str) -> str:
             "common_names": f"Common names in {race} {religion} culture"
         }
         
-        return json.dumps(context, indent=2)
+        return json.dumps(context)
     except Exception as e:
         logger.error(f"Error getting cultural context: {e}")
         return json.dumps({"error": str(e)})
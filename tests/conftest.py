@@ -0,0 +1,27 @@
+"""
+Shared fixtures for the Name Generation System tests.
+"""
+
+import os
+import sys
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'python_frontend'))
+
+import strands_mcp_server
+
+
+@pytest.fixture(scope="session")
+def mcp_base_url():
+    """Serve the MCP handler on an ephemeral loopback port."""
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), strands_mcp_server.StrandsMCPHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
@@ -0,0 +1,127 @@
+"""
+Tests for the frontend's MCP tool result cache.
+"""
+
+import json
+import time
+
+import pytest
+
+import app as frontend
+import strands_mcp_server
+
+TOOL = "get_cultural_context"
+
+
+def _reply(text):
+    """Build a tools/call reply carrying text content."""
+    return {"jsonrpc": "2.0", "id": 1, "result": {"content": [{"type": "text", "text": text}]}}
+
+
+@pytest.fixture
+def empty_cache(monkeypatch):
+    """Enable the tool result cache and start each test with it empty."""
+    monkeypatch.setattr(frontend, "MCP_CACHE_ENABLED", True)
+    frontend._mcp_cache.clear()
+    frontend._mcp_refreshing.clear()
+    yield
+    frontend._mcp_cache.clear()
+
+
+@pytest.fixture
+def mcp_calls(monkeypatch, empty_cache):
+    """Record MCP tool calls and answer them with the queued replies."""
+    calls = []
+    replies = []
+
+    def fake_post(tool_name, arguments):
+        calls.append((tool_name, arguments))
+        return replies.pop(0) if replies else _reply(json.dumps({"race": arguments.get("race")}))
+
+    monkeypatch.setattr(frontend, "_post_mcp_tool_call", fake_post)
+    return calls, replies
+
+
+def test_cultural_context_route_is_cached(monkeypatch, empty_cache, mcp_base_url):
+    server_calls = []
+    call_tool = strands_mcp_server.strands_mcp_server.call_tool
+
+    def counting_call_tool(tool_name, arguments):
+        server_calls.append((tool_name, arguments))
+        return call_tool(tool_name, arguments)
+
+    monkeypatch.setattr(strands_mcp_server.strands_mcp_server, "call_tool", counting_call_tool)
+    monkeypatch.setattr(frontend, "MCP_SERVER_URL", mcp_base_url)
+    client = frontend.app.test_client()
+    body = {"region": "Baghdad", "religion": "Islam", "race": "Iraqi"}
+
+    first = client.post('/api/mcp/cultural-context', json=body)
+    second = client.post('/api/mcp/cultural-context', json=body)
+
+    assert first.status_code == second.status_code == 200
+    assert first.get_json() == second.get_json()
+    context = json.loads(first.get_json()["result"]["content"][0]["text"])
+    assert context["location"] == "Baghdad"
+    assert context["race"] == "Iraqi"
+    assert server_calls == [
+        ("get_cultural_context", {"race": "Iraqi", "religion": "Islam", "location": "Baghdad"})
+    ]
+    assert len(frontend._mcp_cache) == 1
+
+
+def test_successful_result_is_cached(mcp_calls):
+    calls, _ = mcp_calls
+
+    first = frontend._call_mcp_tool(TOOL, {"race": "a"})
+    second = frontend._call_mcp_tool(TOOL, {"race": "a"})
+
+    assert first == second
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize("reply", [
+    _reply("Error: tool failed"),
+    _reply(json.dumps({"error": "boom"})),
+    {"jsonrpc": "2.0", "id": 1, "error": {"code": -32603, "message": "Internal error"}},
+    {"jsonrpc": "2.0", "id": 1, "result": {"content": [], "isError": True}},
+])
+def test_error_results_are_not_cached(mcp_calls, reply):
+    calls, replies = mcp_calls
+    replies.append(reply)
+
+    assert frontend._call_mcp_tool(TOOL, {"race": "x"}) == reply
+    frontend._call_mcp_tool(TOOL, {"race": "x"})
+
+    assert len(calls) == 2
+
+
+def test_cache_evicts_least_recently_used(mcp_calls, monkeypatch):
+    calls, _ = mcp_calls
+    monkeypatch.setattr(frontend, "MCP_CACHE_MAX_ENTRIES", 2)
+
+    frontend._call_mcp_tool(TOOL, {"race": "a"})
+    frontend._call_mcp_tool(TOOL, {"race": "b"})
+    frontend._call_mcp_tool(TOOL, {"race": "a"})
+    frontend._call_mcp_tool(TOOL, {"race": "c"})
+
+    assert len(frontend._mcp_cache) == 2
+    frontend._call_mcp_tool(TOOL, {"race": "a"})
+    assert len(calls) == 3
+    frontend._call_mcp_tool(TOOL, {"race": "b"})
+    assert len(calls) == 4
+
+
+def test_entry_past_max_stale_is_refetched(mcp_calls):
+    calls, _ = mcp_calls
+    frontend._call_mcp_tool(TOOL, {"race": "a"})
+
+    # Age the entry beyond its TTL plus the stale allowance
+    key = frontend._mcp_cache_key(TOOL, {"race": "a"})
+    max_age = frontend.MCP_CACHE_TTLS[TOOL] + frontend.MCP_CACHE_MAX_STALE
+    _, result = frontend._mcp_cache[key]
+    frontend._mcp_cache[key] = (time.monotonic() - max_age - 1, result)
+
+    frontend._call_mcp_tool(TOOL, {"race": "a"})
+
+    assert len(calls) == 2
+    assert time.monotonic() - frontend._mcp_cache[key][0] < 1
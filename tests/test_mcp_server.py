@@ -0,0 +1,59 @@
+"""
+Tests for the Strands MCP server's HTTP handler.
+"""
+
+import gzip
+import json
+
+import pytest
+import requests
+
+import strands_mcp_server
+
+LIST_TOOLS = {"jsonrpc": "2.0", "id": 1, "method": "tools/list"}
+
+
+@pytest.fixture
+def mcp_url(mcp_base_url):
+    """URL of the MCP endpoint on the test server."""
+    return f"{mcp_base_url}/mcp"
+
+
+def _post_gzip(url, body):
+    """POST a gzip-encoded JSON body."""
+    headers = {"Content-Type": "application/json", "Content-Encoding": "gzip"}
+    return requests.post(url, data=body, headers=headers, timeout=5)
+
+
+def test_gzip_request_body_is_accepted(mcp_url):
+    response = _post_gzip(mcp_url, gzip.compress(json.dumps(LIST_TOOLS).encode()))
+
+    assert response.status_code == 200
+    assert response.json()["result"]["tools"]
+
+
+def test_oversized_request_body_is_rejected(mcp_url):
+    body = b" " * (strands_mcp_server.MAX_BODY_BYTES + 1)
+
+    response = requests.post(mcp_url, data=body, timeout=5)
+
+    assert response.status_code == 413
+    assert response.json()["error"]["code"] == -32600
+
+
+def test_gzip_body_expanding_past_limit_is_rejected(mcp_url):
+    # Well under the raw limit, but inflates to five times the decompressed limit
+    body = gzip.compress(b" " * (5 * strands_mcp_server.MAX_BODY_BYTES))
+    assert len(body) < strands_mcp_server.MAX_BODY_BYTES
+
+    response = _post_gzip(mcp_url, body)
+
+    assert response.status_code == 413
+
+
+def test_truncated_gzip_body_is_an_error(mcp_url):
+    body = gzip.compress(json.dumps(LIST_TOOLS).encode())[:-10]
+
+    response = _post_gzip(mcp_url, body)
+
+    assert response.status_code == 500
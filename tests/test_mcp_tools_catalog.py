@@ -0,0 +1,52 @@
+"""
+Tests for tool catalog revalidation between the frontend and the MCP server.
+"""
+
+import pytest
+import requests
+
+import app as frontend
+
+
+@pytest.fixture
+def empty_catalog(monkeypatch, mcp_base_url):
+    """Point the frontend at the test server with no cached tool catalog."""
+    monkeypatch.setattr(frontend, "MCP_SERVER_URL", mcp_base_url)
+    monkeypatch.setattr(frontend, "_mcp_tools_cache", {"etag": None, "tools": None})
+
+
+def test_server_answers_matching_etag_with_304(mcp_base_url):
+    first = requests.get(f"{mcp_base_url}/mcp", timeout=5)
+    etag = first.headers["ETag"]
+
+    second = requests.get(f"{mcp_base_url}/mcp", headers={"If-None-Match": etag}, timeout=5)
+
+    assert first.status_code == 200
+    assert first.json()["tools"]
+    assert second.status_code == 304
+    assert second.headers["ETag"] == etag
+    assert second.content == b""
+
+
+def test_server_answers_stale_etag_with_catalog(mcp_base_url):
+    response = requests.get(f"{mcp_base_url}/mcp", headers={"If-None-Match": '"stale"'}, timeout=5)
+
+    assert response.status_code == 200
+    assert response.json()["tools"]
+
+
+def test_proxy_reuses_cached_catalog_on_304(empty_catalog):
+    client = frontend.app.test_client()
+
+    first = client.get('/api/mcp/tools')
+    assert first.status_code == 200
+    assert frontend._mcp_tools_cache["etag"]
+    assert frontend._mcp_tools_cache["tools"] == first.get_json()
+
+    # A 304 from the server must be answered from the cached catalog
+    cached = {"tools": [{"name": "cached_tool"}]}
+    frontend._mcp_tools_cache["tools"] = cached
+    second = client.get('/api/mcp/tools')
+
+    assert second.status_code == 200
+    assert second.get_json() == cached